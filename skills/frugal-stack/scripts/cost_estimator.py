@@ -7,16 +7,23 @@ Usage:
     python cost_estimator.py                    # Interactive mode
     python cost_estimator.py --users 1000       # Quick estimate
     python cost_estimator.py --json config.json # From config file
+    python cost_estimator.py --jsonl batch.jsonl # Batch estimates as JSON Lines
+
+Requires Python 3.10+. orjson and ijson are used when installed (optional).
 """
 
 import argparse
+import codecs
+import functools
 import json
+import math
 import sys
-from dataclasses import dataclass, field
-from typing import Optional
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from typing import Optional, TextIO
 
 
-@dataclass
+@dataclass(slots=True)
 class AppMetrics:
     """Application usage metrics."""
     users: int = 1000
@@ -27,7 +34,7 @@ class AppMetrics:
     file_uploads_per_user_mb: float = 5
 
 
-@dataclass 
+@dataclass(slots=True)
 class ServiceCost:
     """Individual service cost breakdown."""
     name: str
@@ -43,11 +50,79 @@ class ServiceCost:
         return f"{self.name} ({self.tier}): ${self.total:.2f}"
 
 
+# Pricing tiers per service, keyed by the metric that drives its cost.
+# Each tier is (upper limit, tier, base, included, rate per unit over included, notes);
+# a value is billed by the first tier whose limit it does not exceed.
+PRICING = {
+    "vercel": ("Vercel", [  # bandwidth GB; free tier also has 6000 build minutes
+        (100, "Free", 0, 0, 0, "Within free tier"),
+        (math.inf, "Pro", 20, 1000, 0.15, ""),
+    ]),
+    "cloudflare_pages": ("Cloudflare Pages", [  # unlimited bandwidth, 500 builds/month
+        (math.inf, "Free", 0, 0, 0, "Unlimited bandwidth"),
+    ]),
+    "supabase": ("Supabase", [  # DB storage GB (DB + Auth + Storage)
+        (0.5, "Free", 0, 0, 0, "Within 500MB limit"),
+        (math.inf, "Pro", 25, 8, 0.125, ""),
+    ]),
+    "neon": ("Neon", [  # DB storage GB
+        (0.5, "Free", 0, 0, 0, "Within 512MB limit"),
+        (math.inf, "Launch", 19, 0, 0, "10GB included"),
+    ]),
+    "turso": ("Turso", [  # DB storage GB
+        (9, "Free", 0, 0, 0, "Within 9GB limit"),
+        (math.inf, "Scaler", 29, 0, 0, ""),
+    ]),
+    "cloudflare_r2": ("Cloudflare R2", [  # file storage GB; egress is free
+        (10, "Free", 0, 0, 0, "10GB free, no egress"),
+        (math.inf, "Paid", 0, 10, 0.015, "No egress fees"),
+    ]),
+    "resend": ("Resend", [  # emails/month
+        (3000, "Free", 0, 0, 0, "3k/month free"),
+        (50000, "Pro", 20, 0, 0, "50k included"),
+        (math.inf, "Business", 80, 100000, 0.0004, ""),
+    ]),
+    "clerk": ("Clerk", [  # MAU
+        (10000, "Free", 0, 0, 0, "10k MAU free"),
+        (math.inf, "Pro", 25, 10000, 0.02, ""),
+    ]),
+    "railway": ("Railway", [  # API calls/month; $5 credit covers small apps
+        (math.nextafter(100000, 0), "Free", 0, 0, 0, "$5 credit covers usage"),
+        (math.inf, "Paid", 5, 0, 2 / 1000000, ""),
+    ]),
+}
+
+# Tier upper limits per service, precomputed for bisection
+_PRICING_LIMITS = {
+    service: [t[0] for t in tiers] for service, (_, tiers) in PRICING.items()
+}
+
+
+def price(service: str, value: float) -> ServiceCost:
+    """Look up a service's cost for the value of the metric that drives it."""
+    name, tiers = PRICING[service]
+    _, tier, base, included, rate, notes = tiers[bisect_left(_PRICING_LIMITS[service], value)]
+    usage = (value - included) * rate if rate and value > included else 0
+    return ServiceCost(name, tier, base, usage, base + usage, notes)
+
+
+def _memoized(method):
+    """Compute an estimate_* result once per estimator; it depends only on the metrics."""
+    @functools.wraps(method)
+    def wrapper(self) -> ServiceCost:
+        name = method.__name__
+        if name not in self._estimates:
+            self._estimates[name] = method(self)
+        return self._estimates[name]
+    return wrapper
+
+
 class CostEstimator:
     """Estimate infrastructure costs for various stacks."""
     
     def __init__(self, metrics: AppMetrics):
         self.metrics = metrics
+        self._estimates = {}
         self._calculate_derived()
     
     def _calculate_derived(self):
@@ -59,147 +134,100 @@ class CostEstimator:
         self.total_emails = int(m.users * m.emails_per_user)
         self.total_file_storage_gb = (m.users * m.file_uploads_per_user_mb) / 1024
     
+    @_memoized
     def estimate_vercel(self) -> ServiceCost:
         """Estimate Vercel hosting costs."""
-        # Free tier: 100GB bandwidth, 6000 build minutes
         bandwidth_gb = self.total_page_views * 0.5 / 1024  # ~0.5MB per page
-        
-        if bandwidth_gb <= 100:
-            return ServiceCost("Vercel", "Free", 0, 0, 0, "Within free tier")
-        
-        # Pro tier
-        base = 20
-        overage = max(0, bandwidth_gb - 1000) * 0.15
-        return ServiceCost("Vercel", "Pro", base, overage, base + overage)
+        return price("vercel", bandwidth_gb)
     
+    @_memoized
     def estimate_cloudflare_pages(self) -> ServiceCost:
         """Estimate Cloudflare Pages costs."""
-        # Unlimited bandwidth, 500 builds/month
-        return ServiceCost("Cloudflare Pages", "Free", 0, 0, 0, "Unlimited bandwidth")
+        return price("cloudflare_pages", self.total_page_views)
     
+    @_memoized
     def estimate_supabase(self) -> ServiceCost:
         """Estimate Supabase costs (DB + Auth + Storage)."""
-        storage_gb = self.total_storage_gb
-        
-        if storage_gb <= 0.5:
-            return ServiceCost("Supabase", "Free", 0, 0, 0, "Within 500MB limit")
-        
-        # Pro tier
-        base = 25  # Includes 8GB
-        overage = max(0, storage_gb - 8) * 0.125
-        return ServiceCost("Supabase", "Pro", base, overage, base + overage)
+        return price("supabase", self.total_storage_gb)
     
+    @_memoized
     def estimate_neon(self) -> ServiceCost:
         """Estimate Neon Postgres costs."""
-        storage_gb = self.total_storage_gb
-        
-        if storage_gb <= 0.5:
-            return ServiceCost("Neon", "Free", 0, 0, 0, "Within 512MB limit")
-        
-        # Launch tier
-        base = 19
-        return ServiceCost("Neon", "Launch", base, 0, base, "10GB included")
+        return price("neon", self.total_storage_gb)
     
+    @_memoized
     def estimate_turso(self) -> ServiceCost:
         """Estimate Turso (SQLite) costs."""
-        storage_gb = self.total_storage_gb
-        
-        if storage_gb <= 9:
-            return ServiceCost("Turso", "Free", 0, 0, 0, "Within 9GB limit")
-        
-        base = 29
-        return ServiceCost("Turso", "Scaler", base, 0, base)
+        return price("turso", self.total_storage_gb)
     
+    @_memoized
     def estimate_cloudflare_r2(self) -> ServiceCost:
         """Estimate Cloudflare R2 storage costs."""
-        storage_gb = self.total_file_storage_gb
-        
-        if storage_gb <= 10:
-            return ServiceCost("Cloudflare R2", "Free", 0, 0, 0, "10GB free, no egress")
-        
-        # Storage only, egress is free
-        storage_cost = (storage_gb - 10) * 0.015
-        return ServiceCost("Cloudflare R2", "Paid", 0, storage_cost, storage_cost, "No egress fees")
+        return price("cloudflare_r2", self.total_file_storage_gb)
     
+    @_memoized
     def estimate_resend(self) -> ServiceCost:
         """Estimate Resend email costs."""
-        emails = self.total_emails
-        
-        if emails <= 3000:
-            return ServiceCost("Resend", "Free", 0, 0, 0, "3k/month free")
-        
-        if emails <= 50000:
-            return ServiceCost("Resend", "Pro", 20, 0, 20, "50k included")
-        
-        # Business
-        base = 80
-        overage = max(0, emails - 100000) * 0.0004
-        return ServiceCost("Resend", "Business", base, overage, base + overage)
+        return price("resend", self.total_emails)
     
+    @_memoized
     def estimate_clerk(self) -> ServiceCost:
         """Estimate Clerk auth costs."""
-        mau = self.metrics.users
-        
-        if mau <= 10000:
-            return ServiceCost("Clerk", "Free", 0, 0, 0, "10k MAU free")
-        
-        # Pro tier
-        base = 25
-        overage = max(0, mau - 10000) * 0.02
-        return ServiceCost("Clerk", "Pro", base, overage, base + overage)
+        return price("clerk", self.metrics.users)
     
+    @_memoized
     def estimate_railway(self) -> ServiceCost:
         """Estimate Railway hosting costs."""
-        # $5 credit covers small apps
-        if self.total_api_calls < 100000:
-            return ServiceCost("Railway", "Free", 0, 0, 0, "$5 credit covers usage")
-        
-        # Estimate based on usage
-        estimated = 5 + (self.total_api_calls / 1000000) * 2
-        return ServiceCost("Railway", "Paid", 5, estimated - 5, estimated)
+        return price("railway", self.total_api_calls)
     
-    def get_frugal_stack(self) -> dict:
-        """Get the most cost-effective stack."""
-        services = [
-            self.estimate_cloudflare_pages(),
-            self.estimate_supabase(),
-            self.estimate_cloudflare_r2(),
-            self.estimate_resend(),
-        ]
-        
-        total = sum(s.total for s in services)
-        
+    def get_service_estimates(self) -> dict[str, ServiceCost]:
+        """Estimate each service once, keyed like PRICING."""
         return {
-            "name": "Frugal Stack (Cloudflare + Supabase)",
-            "services": services,
-            "total": total,
-            "notes": "Best for $0-$50/month budgets"
+            "vercel": self.estimate_vercel(),
+            "cloudflare_pages": self.estimate_cloudflare_pages(),
+            "supabase": self.estimate_supabase(),
+            "neon": self.estimate_neon(),
+            "turso": self.estimate_turso(),
+            "cloudflare_r2": self.estimate_cloudflare_r2(),
+            "resend": self.estimate_resend(),
+            "clerk": self.estimate_clerk(),
+            "railway": self.estimate_railway(),
         }
     
-    def get_vercel_stack(self) -> dict:
-        """Get Vercel-based stack."""
-        services = [
-            self.estimate_vercel(),
-            self.estimate_neon(),
-            self.estimate_cloudflare_r2(),
-            self.estimate_resend(),
-            self.estimate_clerk(),
-        ]
-        
-        total = sum(s.total for s in services)
-        
+    @staticmethod
+    def _stack(name: str, services: list[ServiceCost], notes: str) -> dict:
+        """Build a stack summary from its service estimates."""
         return {
-            "name": "Vercel Stack (Best DX)",
+            "name": name,
             "services": services,
-            "total": total,
-            "notes": "Best developer experience"
+            "total": sum(s.total for s in services),
+            "notes": notes
         }
     
+    def get_frugal_stack(self, estimates: Optional[dict] = None) -> dict:
+        """Get the most cost-effective stack."""
+        est = estimates or self.get_service_estimates()
+        return self._stack(
+            "Frugal Stack (Cloudflare + Supabase)",
+            [est["cloudflare_pages"], est["supabase"], est["cloudflare_r2"], est["resend"]],
+            "Best for $0-$50/month budgets"
+        )
+    
+    def get_vercel_stack(self, estimates: Optional[dict] = None) -> dict:
+        """Get Vercel-based stack."""
+        est = estimates or self.get_service_estimates()
+        return self._stack(
+            "Vercel Stack (Best DX)",
+            [est["vercel"], est["neon"], est["cloudflare_r2"], est["resend"], est["clerk"]],
+            "Best developer experience"
+        )
+    
     def get_all_estimates(self) -> list[dict]:
-        """Get estimates for all stack options."""
+        """Get estimates for all stack options, sharing one set of service estimates."""
+        est = self.get_service_estimates()
         return [
-            self.get_frugal_stack(),
-            self.get_vercel_stack(),
+            self.get_frugal_stack(est),
+            self.get_vercel_stack(est),
         ]
     
     def print_report(self):
@@ -257,50 +285,125 @@ class CostEstimator:
             print("   • May be time to hire DevOps help")
 
 
+# (prompt, AppMetrics field, type) for each interactive question
+INTERACTIVE_PROMPTS = (
+    ("Expected monthly active users", "users", int),
+    ("Page views per user per month", "page_views_per_user", int),
+    ("API calls per page view", "api_calls_per_page", int),
+    ("Database storage per user (MB)", "storage_per_user_mb", float),
+    ("Emails per user per month", "emails_per_user", float),
+    ("File uploads per user (MB)", "file_uploads_per_user_mb", float),
+)
+
+
+def _run(metrics: AppMetrics):
+    """Estimate costs for the given metrics and print the report."""
+    CostEstimator(metrics).print_report()
+
+
 def interactive_mode():
     """Run interactive cost estimation."""
     print("\n🚀 Frugal Stack Cost Estimator")
     print("Answer a few questions to estimate your costs.\n")
     
-    try:
-        users = int(input("Expected monthly active users [1000]: ") or "1000")
-        page_views = int(input("Page views per user per month [30]: ") or "30")
-        api_calls = int(input("API calls per page view [5]: ") or "5")
-        storage = float(input("Database storage per user (MB) [10]: ") or "10")
-        emails = float(input("Emails per user per month [1]: ") or "1")
-        files = float(input("File uploads per user (MB) [5]: ") or "5")
-    except ValueError:
-        print("Invalid input. Using defaults.")
-        users, page_views, api_calls, storage, emails, files = 1000, 30, 5, 10, 1, 5
-    
-    metrics = AppMetrics(
-        users=users,
-        page_views_per_user=page_views,
-        api_calls_per_page=api_calls,
-        storage_per_user_mb=storage,
-        emails_per_user=emails,
-        file_uploads_per_user_mb=files
-    )
+    defaults = AppMetrics()
+    values = {}
+    for prompt, name, cast in INTERACTIVE_PROMPTS:
+        default = getattr(defaults, name)
+        answer = input(f"{prompt} [{default}]: ")
+        try:
+            values[name] = cast(answer or str(default))
+        except ValueError:
+            print(f"Invalid input. Using default ({default}).")
+            values[name] = cast(default)
     
-    estimator = CostEstimator(metrics)
-    estimator.print_report()
+    _run(AppMetrics(**values))
 
 
 def quick_estimate(users: int):
     """Quick estimate with just user count."""
-    metrics = AppMetrics(users=users)
-    estimator = CostEstimator(metrics)
-    estimator.print_report()
+    _run(AppMetrics(users=users))
+
+
+def _parse_json(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def _dump_json(data) -> str:
+    """Serialize to compact JSON, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        # Same bytes orjson would produce: compact separators, non-ASCII kept raw
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return orjson.dumps(data).decode('utf-8')
+
+
+def _load_json(path: str):
+    """Parse a JSON file."""
+    with open(path, 'rb') as f:
+        return _parse_json(f.read().removeprefix(codecs.BOM_UTF8))
+
+
+def _skip_bom_and_peek(f) -> bytes:
+    """
+    Position f just past any UTF-8 BOM and return the first non-whitespace
+    byte after it (b'' for an empty file), without consuming anything else.
+    """
+    start = len(codecs.BOM_UTF8) if f.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8 else 0
+    f.seek(start)
+    first = b''
+    for chunk in iter(lambda: f.read(4096), b''):
+        stripped = chunk.lstrip()
+        if stripped:
+            first = stripped[:1]
+            break
+    f.seek(start)
+    return first
 
 
 def from_json(config_path: str):
     """Load metrics from JSON file."""
-    with open(config_path) as f:
-        config = json.load(f)
-    
-    metrics = AppMetrics(**config)
-    estimator = CostEstimator(metrics)
-    estimator.print_report()
+    _run(AppMetrics(**_load_json(config_path)))
+
+
+def iter_metrics(path: str):
+    """
+    Stream AppMetrics records from a JSON Lines file or a JSON array of configs.
+    Arrays are parsed incrementally with ijson when it is installed, so memory
+    stays constant however many records the file holds.
+    """
+    with open(path, 'rb') as f:
+        if _skip_bom_and_peek(f) == b'[':
+            try:
+                import ijson
+            except ImportError:
+                records = json.load(f)
+            else:
+                records = ijson.items(f, 'item', use_float=True)
+        else:
+            records = (_parse_json(line) for line in f if line.strip())
+        
+        for record in records:
+            yield AppMetrics(**record)
+
+
+def batch_estimate(path: str, out: Optional[TextIO] = None):
+    """Estimate every config in a batch file, writing one JSON result per line."""
+    out = out or sys.stdout
+    for metrics in iter_metrics(path):
+        estimator = CostEstimator(metrics)
+        result = asdict(metrics)
+        result["stacks"] = {
+            stack["name"]: round(stack["total"], 2)
+            for stack in estimator.get_all_estimates()
+        }
+        out.write(_dump_json(result) + "\n")
 
 
 def main():
@@ -312,6 +415,7 @@ Examples:
     python cost_estimator.py                     # Interactive mode
     python cost_estimator.py --users 5000        # Quick estimate
     python cost_estimator.py --json metrics.json # From config file
+    python cost_estimator.py --jsonl batch.jsonl # One JSON result per config
 
 Config JSON format:
 {
@@ -322,14 +426,19 @@ Config JSON format:
     "emails_per_user": 1,
     "file_uploads_per_user_mb": 5
 }
+
+Batch files hold one config object per line (JSON Lines) or a JSON array of them.
         """
     )
     parser.add_argument("--users", type=int, help="Quick estimate with user count")
     parser.add_argument("--json", type=str, help="Load metrics from JSON file")
+    parser.add_argument("--jsonl", type=str, help="Estimate each config in a batch file, streaming JSON Lines to stdout")
     
     args = parser.parse_args()
     
-    if args.json:
+    if args.jsonl:
+        batch_estimate(args.jsonl)
+    elif args.json:
         from_json(args.json)
     elif args.users:
         quick_estimate(args.users)
@@ -6,24 +6,67 @@ Combines local Python extraction with LLM enhancement for high-fidelity PDF to M
 Usage:
     python extract_pdf.py <input.pdf> [output.md] [--llm-enhance] [--verbose]
 
-Dependencies:
+Dependencies (Python 3.10+):
     pip install pdfplumber pdf2image pytesseract Pillow pandas --break-system-packages
 """
 
 import argparse
 import base64
+import hashlib
 import io
 import json
 import os
 import re
 import sys
 import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TextIO
 
 
-@dataclass
+# Upper bound on pages rasterized per pdf2image call (300 DPI pages are ~25MB each)
+OCR_BATCH_PAGES = 16
+
+# OCR first runs at OCR_DPI; pages whose mean word confidence falls below
+# OCR_MIN_CONFIDENCE are rasterized and recognized again at OCR_RETRY_DPI
+OCR_DPI = 150
+OCR_RETRY_DPI = 300
+OCR_MIN_CONFIDENCE = 60
+
+# Pages per extraction task; bounds how much markdown is buffered before it is written
+MAX_PAGES_PER_RANGE = 32
+
+# Text objects whose tops are within this many points share a line; matches
+# the y_tolerance pdfplumber uses when it orders text into lines
+TEXT_LINE_TOLERANCE = 3
+
+# Write buffer for the output markdown file
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+# Model used for --llm-enhance, and where its responses are cached
+LLM_MODEL = "claude-sonnet-4-20250514"
+LLM_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'pdf2md'
+
+# Line classifier used by PDFExtractor._format_text; alternatives are tried in
+# order, so "1.2 Title" is a numbered header before it could be a list item.
+# Numbered list items ("1. item") need no rewriting and fall through unmatched.
+_LINE_RE = re.compile(r'^(?:(?P<numbered_header>[\d.]+\s+[A-Z])|(?P<bullet>[•\-\*]\s+))')
+
+# ExtractionMetrics counters that page extraction workers report back as deltas
+METRIC_FIELDS = (
+    'pages_with_text',
+    'pages_with_tables',
+    'pages_with_images',
+    'tables_extracted',
+    'images_extracted',
+    'ocr_pages',
+)
+
+
+@dataclass(slots=True)
 class ExtractionMetrics:
     """Track extraction quality metrics for fetch score calculation."""
     total_pages: int = 0
@@ -40,43 +83,38 @@ class ExtractionMetrics:
     
     def calculate_fetch_score(self) -> dict:
         """Calculate overall fetch score (0-100) with component breakdown."""
-        scores = {}
-        
         # Text extraction score (40% weight)
         if self.total_pages > 0:
             text_ratio = self.pages_with_text / self.total_pages
-            scores['text_extraction'] = min(100, text_ratio * 100 + self.text_confidence * 20)
+            text_score = min(100, text_ratio * 100 + self.text_confidence * 20)
         else:
-            scores['text_extraction'] = 0
+            text_score = 0
             
         # Structure preservation score (30% weight)
-        structure_score = 50  # Base score
-        if self.tables_extracted > 0:
-            structure_score += 25
-        if self.images_extracted > 0:
-            structure_score += 15
-        if self.llm_enhanced:
-            structure_score += 10
-        scores['structure_preservation'] = min(100, structure_score + self.structure_confidence * 20)
+        structure_score = (
+            50  # Base score
+            + (25 if self.tables_extracted > 0 else 0)
+            + (15 if self.images_extracted > 0 else 0)
+            + (10 if self.llm_enhanced else 0)
+        )
+        structure_score = min(100, structure_score + self.structure_confidence * 20)
         
         # Completeness score (30% weight)
-        completeness = 100
+        completeness = 100 - min(30, len(self.warnings) * 5)
         if self.ocr_pages > 0 and self.ocr_pages == self.total_pages:
             completeness -= 20  # OCR-only docs have lower confidence
-        if len(self.warnings) > 0:
-            completeness -= min(30, len(self.warnings) * 5)
-        scores['completeness'] = max(0, completeness)
+        completeness = max(0, completeness)
         
         # Overall weighted score
-        overall = (
-            scores['text_extraction'] * 0.4 +
-            scores['structure_preservation'] * 0.3 +
-            scores['completeness'] * 0.3
-        )
+        overall = text_score * 0.4 + structure_score * 0.3 + completeness * 0.3
         
         return {
             'overall_score': round(overall, 1),
-            'components': {k: round(v, 1) for k, v in scores.items()},
+            'components': {
+                'text_extraction': round(text_score, 1),
+                'structure_preservation': round(structure_score, 1),
+                'completeness': round(completeness, 1),
+            },
             'grade': self._score_to_grade(overall),
             'total_pages': self.total_pages,
             'tables_found': self.tables_extracted,
@@ -86,6 +124,16 @@ class ExtractionMetrics:
             'warnings': self.warnings
         }
     
+    def counts(self) -> tuple[int, ...]:
+        """Counter values, in METRIC_FIELDS order."""
+        return tuple(getattr(self, name) for name in METRIC_FIELDS)
+    
+    def merge(self, counts: tuple[int, ...], warnings: list):
+        """Add counter deltas (in METRIC_FIELDS order) and warnings from a worker."""
+        for name, delta in zip(METRIC_FIELDS, counts):
+            setattr(self, name, getattr(self, name) + delta)
+        self.warnings.extend(warnings)
+    
     @staticmethod
     def _score_to_grade(score: float) -> str:
         if score >= 90: return 'A - Excellent'
@@ -98,39 +146,47 @@ class ExtractionMetrics:
 class PDFExtractor:
     """Main PDF extraction class with multi-method extraction."""
     
-    def __init__(self, pdf_path: str, verbose: bool = False):
+    def __init__(self, pdf_path: str, verbose: bool = False, workers: Optional[int] = None):
         self.pdf_path = Path(pdf_path)
         self.verbose = verbose
+        self.workers = workers or os.cpu_count() or 1
         self.metrics = ExtractionMetrics()
         self.extracted_images_dir = None
+        # Resources held for one extract() run, e.g. the OCR engine
+        self._resources = ExitStack()
+        self._recognize = None
         
     def log(self, msg: str):
         if self.verbose:
             print(f"[INFO] {msg}", file=sys.stderr)
     
-    def extract(self) -> tuple[str, dict]:
+    def extract(self, out: TextIO) -> dict:
         """
         Main extraction pipeline.
-        Returns: (markdown_content, fetch_score_dict)
+        Streams each page's markdown to `out` as soon as it is ready, so only a
+        few page ranges are held in memory at a time.
+        Returns: fetch_score_dict
         """
         import pdfplumber
         
         self.log(f"Opening PDF: {self.pdf_path}")
         
-        markdown_parts = []
-        
         with pdfplumber.open(self.pdf_path) as pdf:
             self.metrics.total_pages = len(pdf.pages)
-            self.log(f"Total pages: {self.metrics.total_pages}")
-            
-            for page_num, page in enumerate(pdf.pages, 1):
-                self.log(f"Processing page {page_num}/{self.metrics.total_pages}")
-                page_md = self._extract_page(page, page_num)
-                if page_md.strip():
-                    markdown_parts.append(page_md)
-                    
-        # Combine all pages
-        markdown_content = "\n\n---\n\n".join(markdown_parts)
+        self.log(f"Total pages: {self.metrics.total_pages}")
+        
+        # The OCR engine is loaded on first use and kept until all pages are done
+        try:
+            with self._resources:
+                wrote_page = False
+                for page_md in self._assembled_pages():
+                    if page_md.strip():
+                        if wrote_page:
+                            out.write("\n\n---\n\n")
+                        out.write(page_md)
+                        wrote_page = True
+        finally:
+            self._recognize = None
         
         # Calculate final metrics
         if self.metrics.pages_with_text > 0:
@@ -138,49 +194,185 @@ class PDFExtractor:
         
         fetch_score = self.metrics.calculate_fetch_score()
         
-        return markdown_content, fetch_score
+        return fetch_score
     
-    def _extract_page(self, page, page_num: int) -> str:
-        """Extract content from a single page."""
-        parts = []
+    def _assembled_pages(self):
+        """
+        Yield each page's markdown, in page order.
+        A run of pages without a text layer may continue into the next range,
+        so the part of it that doesn't fill an OCR batch is held back until the
+        next range arrives; OCR batches then don't depend on the range size.
+        """
+        held = []
+        for page_results, counts, warnings in self._map_page_ranges():
+            self.metrics.merge(counts, warnings)
+            held.extend(page_results)
+            
+            # Find where the run of pages needing OCR at the end of `held` starts
+            keep = len(held)
+            while keep and held[keep - 1][3]:
+                keep -= 1
+            run_len = len(held) - keep
+            keep += run_len - run_len % OCR_BATCH_PAGES
+            
+            yield from self._assemble_pages(held[:keep])
+            held = held[keep:]
         
-        # Add page header
-        parts.append(f"<!-- Page {page_num} -->")
+        yield from self._assemble_pages(held)
+    
+    def _assemble_pages(self, page_results: list):
+        """OCR the pages that need it in one go, then yield each page's markdown."""
+        ocr_needed = [page_num for page_num, _, _, needs_ocr in page_results if needs_ocr]
+        ocr_texts, ocr_errors = self._ocr_pages(ocr_needed) if ocr_needed else ({}, {})
+        for page_num, text, body_parts, _ in page_results:
+            yield self._assemble_page(page_num, text, body_parts, ocr_texts.get(page_num),
+                                      ocr_errors.get(page_num, []))
+    
+    def _map_page_ranges(self):
+        """Yield (page_results, counts, warnings) for consecutive page ranges, in page order."""
+        total = self.metrics.total_pages
+        workers = max(1, min(self.workers, total))
+        
+        # A few ranges per worker keeps cores busy when page costs are uneven,
+        # while each range still opens the PDF only once
+        chunk = min(MAX_PAGES_PER_RANGE, -(-total // (workers * 4)) or 1)
+        ranges = [(first, min(first + chunk - 1, total)) for first in range(1, total + 1, chunk)]
+        
+        if workers == 1:
+            for first, last in ranges:
+                yield _extract_page_range(str(self.pdf_path), first, last)
+            return
+        
+        self.log(f"Extracting {len(ranges)} page ranges with {workers} workers")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Bound the number of finished-but-unwritten ranges held in memory
+            pending = deque()
+            for first, last in ranges:
+                pending.append(executor.submit(_extract_page_range, str(self.pdf_path), first, last))
+                if len(pending) > workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def _extract_page(self, page, page_num: int) -> tuple[int, Optional[str], list[str], bool]:
+        """
+        Extract content from a single pdfplumber page.
+        Returns: (page_num, formatted_text or None, table/image parts, needs_ocr)
+        """
+        # Lay the page out once; text, table and image lookups all read this cache
+        objects = page.objects
         
-        # 1. Extract text
-        text = page.extract_text()
+        has_chars = bool(objects.get('char'))
+        text = page.extract_text() if has_chars else None
+        
+        # The default "lines" table strategy needs ruling lines to find any tables
+        if objects.get('line') or objects.get('rect') or objects.get('curve'):
+            tables = page.find_tables()
+        else:
+            tables = []
+        
+        return self._page_result(page_num, text, tables, len(objects.get('image', ())), has_chars)
+    
+    def _extract_page_fast(self, page, page_num: int) -> Optional[tuple[int, Optional[str], list[str], bool]]:
+        """
+        Extract a single pypdfium2 page through PDFium's native text layer.
+        Pages with vector paths may contain ruled tables, which only pdfplumber
+        can detect; for those this returns None and the caller falls back.
+        PDFium returns text in content-stream order while pdfplumber sorts it
+        top to bottom, so pages whose text is drawn in any other order (e.g. a
+        header drawn last) also fall back.
+        """
+        import pypdfium2.raw as pdfium_c
+        
+        n_images = 0
+        has_chars = False
+        prev_top = prev_right = None
+        object_types = (pdfium_c.FPDF_PAGEOBJ_TEXT, pdfium_c.FPDF_PAGEOBJ_IMAGE, pdfium_c.FPDF_PAGEOBJ_PATH)
+        for obj in page.get_objects(filter=object_types):
+            if obj.type == pdfium_c.FPDF_PAGEOBJ_PATH:
+                return None
+            if obj.type == pdfium_c.FPDF_PAGEOBJ_IMAGE:
+                n_images += 1
+                continue
+            has_chars = True
+            
+            # PDF y grows upwards; each object must start a lower line, or
+            # continue the previous one to its right (get_pos is pypdfium2 < 5)
+            get_bounds = obj.get_bounds if hasattr(obj, 'get_bounds') else obj.get_pos
+            left, _, right, top = get_bounds()
+            if prev_top is not None:
+                if top > prev_top + TEXT_LINE_TOLERANCE:
+                    return None
+                if top >= prev_top - TEXT_LINE_TOLERANCE and left < prev_right - 1:
+                    return None
+            prev_top, prev_right = top, right
+        
+        text = None
+        if has_chars:
+            textpage = page.get_textpage()
+            text = textpage.get_text_range().replace('\r\n', '\n')
+            textpage.close()
+        
+        return self._page_result(page_num, text, [], n_images, has_chars)
+    
+    def _page_result(self, page_num: int, text: Optional[str], tables: list, n_images: int,
+                     has_chars: bool) -> tuple[int, Optional[str], list[str], bool]:
+        """Format a page's raw text, tables and image count, updating metrics."""
+        # 1. Text
         if text and text.strip():
             self.metrics.pages_with_text += 1
-            formatted_text = self._format_text(text)
-            parts.append(formatted_text)
+            text = self._format_text(text)
         else:
-            # Try OCR if no text found
-            ocr_text = self._try_ocr(page, page_num)
-            if ocr_text:
-                self.metrics.ocr_pages += 1
-                self.metrics.pages_with_text += 1
-                parts.append(f"<!-- OCR extracted -->\n{ocr_text}")
-            else:
-                self.metrics.warnings.append(f"Page {page_num}: No text extracted")
+            text = None
+        
+        # Only pages with no text objects but some image content can be scans;
+        # blank pages and whitespace-only text layers are not worth rasterizing
+        needs_ocr = text is None and not has_chars and n_images > 0
+        
+        parts = []
         
-        # 2. Extract tables
-        tables = page.extract_tables()
+        # 2. Tables
         if tables:
             self.metrics.pages_with_tables += 1
-            for i, table in enumerate(tables):
-                if table and len(table) > 0:
+            for table in tables:
+                rows = table.extract()
+                if rows:
                     self.metrics.tables_extracted += 1
-                    table_md = self._table_to_markdown(table)
+                    table_md = self._table_to_markdown(rows)
                     parts.append(f"\n{table_md}\n")
         
-        # 3. Extract images
-        images = page.images
-        if images:
+        # 3. Image references (only the count is needed)
+        if n_images:
             self.metrics.pages_with_images += 1
-            for i, img in enumerate(images):
-                self.metrics.images_extracted += 1
-                img_ref = f"![Image {page_num}.{i+1}](image_p{page_num}_{i+1}.png)"
-                parts.append(f"\n{img_ref}\n")
+            self.metrics.images_extracted += n_images
+            for i in range(1, n_images + 1):
+                parts.append(f"\n![Image {page_num}.{i}](image_p{page_num}_{i}.png)\n")
+        
+        return page_num, text, parts, needs_ocr
+    
+    def _assemble_page(self, page_num: int, text: Optional[str], body_parts: list[str],
+                       ocr_text: Optional[str], ocr_errors: list[str]) -> str:
+        """
+        Build a page's markdown, falling back to OCR output if it had no text.
+        OCR errors are recorded here rather than by _ocr_pages, so warnings
+        stay in page order however pages were grouped for OCR.
+        """
+        self.metrics.warnings.extend(ocr_errors)
+        parts = []
+        
+        # Add page header
+        parts.append(f"<!-- Page {page_num} -->")
+        
+        if text is not None:
+            parts.append(text)
+        elif ocr_text:
+            self.metrics.ocr_pages += 1
+            self.metrics.pages_with_text += 1
+            parts.append(f"<!-- OCR extracted -->\n{ocr_text}")
+        else:
+            self.metrics.warnings.append(f"Page {page_num}: No text extracted")
+        
+        parts.extend(body_parts)
         
         return "\n\n".join(parts)
     
@@ -198,89 +390,219 @@ class PDFExtractor:
             # Detect potential headers (short lines, possibly all caps or with numbers)
             if len(stripped) < 80 and stripped.isupper():
                 formatted_lines.append(f"## {stripped.title()}")
-            elif re.match(r'^[\d.]+\s+[A-Z]', stripped):
-                # Numbered section headers
+                continue
+            
+            match = _LINE_RE.match(stripped)
+            kind = match.lastgroup if match else None
+            if kind == 'numbered_header':
                 formatted_lines.append(f"### {stripped}")
-            elif re.match(r'^[•\-\*]\s+', stripped):
-                # Bullet points
+            elif kind == 'bullet':
                 formatted_lines.append(f"- {stripped[2:].strip()}")
-            elif re.match(r'^\d+\.\s+', stripped):
-                # Numbered lists
-                formatted_lines.append(stripped)
             else:
+                # Plain text and numbered lists are kept as-is
                 formatted_lines.append(stripped)
         
         return '\n'.join(formatted_lines)
     
     def _table_to_markdown(self, table: list) -> str:
         """Convert extracted table to markdown format."""
-        if not table or len(table) == 0:
-            return ""
-        
         # Clean table cells
-        cleaned_table = []
-        for row in table:
-            if row:
-                cleaned_row = [str(cell).strip() if cell else '' for cell in row]
-                cleaned_table.append(cleaned_row)
-        
+        cleaned_table = [
+            [str(cell).strip() if cell else '' for cell in row]
+            for row in table if row
+        ]
         if not cleaned_table:
             return ""
         
-        # Determine column count
+        # Determine column count; short rows are padded with empty cells
         max_cols = max(len(row) for row in cleaned_table)
         
-        # Normalize rows
-        for row in cleaned_table:
-            while len(row) < max_cols:
-                row.append('')
-        
-        md_lines = []
-        
-        # Header row
-        header = cleaned_table[0]
-        md_lines.append('| ' + ' | '.join(header) + ' |')
-        md_lines.append('| ' + ' | '.join(['---'] * max_cols) + ' |')
+        md_lines = [
+            f"| {' | '.join(row)}{' | ' * (max_cols - len(row))} |"
+            for row in cleaned_table
+        ]
         
-        # Data rows
-        for row in cleaned_table[1:]:
-            md_lines.append('| ' + ' | '.join(row) + ' |')
+        # Separator goes after the header row
+        md_lines.insert(1, '| ' + ' | '.join(['---'] * max_cols) + ' |')
         
         return '\n'.join(md_lines)
     
-    def _try_ocr(self, page, page_num: int) -> Optional[str]:
-        """Attempt OCR on page if regular extraction fails."""
+    def _ocr_pages(self, page_nums: list[int]) -> tuple[dict[int, str], dict[int, list[str]]]:
+        """
+        OCR the given pages at OCR_DPI, re-running pages Tesseract is unsure
+        about at OCR_RETRY_DPI.
+        Returns: ({page_num: formatted_text} for pages where OCR found text,
+                  {page_num: [error warnings]})
+        """
+        errors = {}
         try:
             from pdf2image import convert_from_path
-            import pytesseract
-            
-            self.log(f"Attempting OCR on page {page_num}")
-            
-            # Convert specific page to image
-            images = convert_from_path(
-                str(self.pdf_path),
-                first_page=page_num,
-                last_page=page_num,
-                dpi=300
-            )
-            
-            if images:
-                text = pytesseract.image_to_string(images[0])
-                if text and text.strip():
-                    return self._format_text(text)
+            if self._recognize is None:
+                self._recognize = self._resources.enter_context(_ocr_engine())
         except ImportError:
-            self.metrics.warnings.append(f"Page {page_num}: OCR libraries not available")
-        except Exception as e:
-            self.metrics.warnings.append(f"Page {page_num}: OCR failed - {str(e)}")
+            for page_num in page_nums:
+                errors[page_num] = [f"Page {page_num}: OCR libraries not available"]
+            return {}, errors
+        
+        ocr = self._ocr_batch(convert_from_path, page_nums, OCR_DPI, errors)
+        
+        retry = [page_num for page_num, (_, conf) in ocr.items() if conf < OCR_MIN_CONFIDENCE]
+        if retry:
+            self.log(f"Low OCR confidence on {len(retry)} page(s), retrying at {OCR_RETRY_DPI} DPI")
+            for page_num, (text, conf) in self._ocr_batch(convert_from_path, retry, OCR_RETRY_DPI, errors).items():
+                if conf >= ocr[page_num][1]:
+                    ocr[page_num] = (text, conf)
+        
+        texts = {
+            page_num: self._format_text(text)
+            for page_num, (text, _) in ocr.items()
+            if text and text.strip()
+        }
+        return texts, errors
+    
+    def _ocr_batch(self, convert_from_path, page_nums: list[int], dpi: int,
+                   errors: dict[int, list[str]]) -> dict[int, tuple[str, float]]:
+        """
+        Rasterize each contiguous run of pages with a single pdf2image call and OCR it.
+        Failures are added to `errors` by page number.
+        Returns: {page_num: (text, mean_confidence)}
+        """
+        results = {}
+        for run in self._page_runs(page_nums, OCR_BATCH_PAGES):
+            self.log(f"Attempting OCR on pages {run[0]}-{run[-1]} at {dpi} DPI")
+            try:
+                images = convert_from_path(
+                    str(self.pdf_path),
+                    first_page=run[0],
+                    last_page=run[-1],
+                    dpi=dpi,
+                    thread_count=os.cpu_count() or 1
+                )
+            except Exception as e:
+                for page_num in run:
+                    errors.setdefault(page_num, []).append(f"Page {page_num}: OCR failed - {str(e)}")
+                continue
+            
+            for page_num, image in zip(run, images):
+                try:
+                    results[page_num] = self._recognize(image)
+                except Exception as e:
+                    errors.setdefault(page_num, []).append(f"Page {page_num}: OCR failed - {str(e)}")
         
-        return None
+        return results
+    
+    @staticmethod
+    def _page_runs(page_nums: list[int], max_len: int) -> list[list[int]]:
+        """Split sorted page numbers into contiguous runs of at most max_len pages."""
+        runs = []
+        for page_num in page_nums:
+            if runs and page_num == runs[-1][-1] + 1 and len(runs[-1]) < max_len:
+                runs[-1].append(page_num)
+            else:
+                runs.append([page_num])
+        return runs
 
 
-def enhance_with_llm(markdown: str, pdf_path: str, verbose: bool = False) -> str:
+@contextmanager
+def _ocr_engine():
+    """
+    Yield an image -> (text, mean word confidence 0-100) OCR function.
+    tesserocr keeps one Tesseract engine (and its model) loaded across pages;
+    pytesseract, the fallback, starts a tesseract process per image.
+    """
+    try:
+        from tesserocr import PyTessBaseAPI
+        api = PyTessBaseAPI()
+    except (ImportError, RuntimeError):
+        # Fall back below, outside this handler, so exceptions raised while
+        # the generator is suspended aren't chained to this one
+        api = None
+    
+    if api is None:
+        import pytesseract
+        
+        def recognize(image) -> tuple[str, float]:
+            # One tesseract run produces both the text and the per-word TSV
+            text, tsv = pytesseract.run_and_get_multiple_output(image, extensions=['txt', 'tsv'])
+            rows = (line.split('\t') for line in tsv.splitlines()[1:])
+            confs = [float(row[10]) for row in rows if len(row) > 11 and float(row[10]) >= 0]
+            return text, (sum(confs) / len(confs) if confs else 0.0)
+        
+        yield recognize
+        return
+    
+    with api:
+        def recognize(image) -> tuple[str, float]:
+            api.SetImage(image)
+            return api.GetUTF8Text(), api.MeanTextConf()
+        yield recognize
+
+
+def _extract_page_range(pdf_path: str, first: int, last: int) -> tuple[list, tuple, list]:
+    """
+    Extract pages first..last (1-based, inclusive); runs in a worker process.
+    Pages go through PDFium when pypdfium2 is installed and the page has no
+    ruled tables and draws its text in reading order; everything else goes
+    through pdfplumber.
+    Returns: (list of PDFExtractor._page_result tuples, counter deltas, warnings)
+    """
+    import pdfplumber
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+    
+    extractor = PDFExtractor(pdf_path)
+    results = []
+    doc = pdfium.PdfDocument(pdf_path) if pdfium else None
+    plumber_pdf = None
+    try:
+        for page_num in range(first, last + 1):
+            if doc is not None:
+                page = doc[page_num - 1]
+                result = extractor._extract_page_fast(page, page_num)
+                page.close()
+                if result is not None:
+                    results.append(result)
+                    continue
+            
+            # Only build pdfplumber Page objects for this range, and only once a
+            # page needs them; drop each page's parsed layout after conversion
+            if plumber_pdf is None:
+                plumber_pdf = pdfplumber.open(pdf_path, pages=list(range(first, last + 1)))
+            page = plumber_pdf.pages[page_num - first]
+            results.append(extractor._extract_page(page, page_num))
+            page.close()
+    finally:
+        if plumber_pdf is not None:
+            plumber_pdf.close()
+        if doc is not None:
+            doc.close()
+    return results, extractor.metrics.counts(), extractor.metrics.warnings
+
+
+def _llm_cache_path(pdf_path: str) -> Path:
+    """Cache file for a PDF's LLM-enhanced markdown, keyed on its content hash and model."""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return LLM_CACHE_DIR / f"{digest.hexdigest()}-{LLM_MODEL}.md"
+
+
+def enhance_with_llm(markdown: str, pdf_path: str, verbose: bool = False,
+                     use_cache: bool = True) -> str:
     """
     Use Claude API to enhance the extracted markdown.
     Improves structure, fixes formatting issues, and adds semantic understanding.
+    Responses are cached on disk so re-running on the same PDF skips the API call.
     """
+    cache_path = _llm_cache_path(pdf_path) if use_cache else None
+    if cache_path is not None and cache_path.is_file():
+        if verbose:
+            print(f"[INFO] Using cached LLM enhancement: {cache_path}", file=sys.stderr)
+        return cache_path.read_text(encoding='utf-8')
+    
     try:
         import anthropic
         
@@ -312,12 +634,12 @@ Extracted content:
 Return ONLY the improved markdown, no explanations."""
 
         message = client.messages.create(
-            model="claude-sonnet-4-20250514",
+            model=LLM_MODEL,
             max_tokens=8192,
             messages=[{"role": "user", "content": prompt}]
         )
         
-        return message.content[0].text
+        enhanced = message.content[0].text
         
     except ImportError:
         if verbose:
@@ -327,10 +649,24 @@ Return ONLY the improved markdown, no explanations."""
         if verbose:
             print(f"[WARN] LLM enhancement failed: {e}", file=sys.stderr)
         return markdown
+    
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so an interrupted run never leaves a partial entry
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_path.parent,
+                                             suffix='.tmp', delete=False) as tmp:
+                tmp.write(enhanced)
+            os.replace(tmp.name, cache_path)
+        except OSError as e:
+            if verbose:
+                print(f"[WARN] Could not cache LLM enhancement: {e}", file=sys.stderr)
+    
+    return enhanced
 
 
-def generate_report(markdown: str, fetch_score: dict, output_path: str) -> str:
-    """Generate the final markdown with fetch score report appended."""
+def format_report(fetch_score: dict) -> str:
+    """Format the fetch score report section appended after the extracted markdown."""
     
     score_section = f"""
 
@@ -359,7 +695,17 @@ def generate_report(markdown: str, fetch_score: dict, output_path: str) -> str:
         for warning in fetch_score['warnings']:
             score_section += f"- {warning}\n"
     
-    return markdown + score_section
+    return score_section
+
+
+def dump_json(data: dict) -> str:
+    """Serialize to indented JSON, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        # orjson writes non-ASCII raw; match it so output doesn't depend on the backend
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
 
 
 def main():
@@ -378,6 +724,8 @@ Examples:
     parser.add_argument('--llm-enhance', action='store_true', help='Use LLM to enhance extraction')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     parser.add_argument('--score-only', action='store_true', help='Output only the fetch score as JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Always call the LLM, ignoring cached enhancements')
+    parser.add_argument('--workers', '-j', type=int, help='Worker processes for page extraction (default: CPU count)')
     
     args = parser.parse_args()
     
@@ -393,27 +741,46 @@ Examples:
     else:
         output_path = input_path.with_suffix('.md')
     
-    # Extract
-    extractor = PDFExtractor(str(input_path), verbose=args.verbose)
-    markdown, fetch_score = extractor.extract()
+    extractor = PDFExtractor(str(input_path), verbose=args.verbose, workers=args.workers)
     
-    # LLM enhancement if requested
     if args.llm_enhance:
-        markdown = enhance_with_llm(markdown, str(input_path), args.verbose)
-        fetch_score['llm_enhanced'] = True
+        # LLM enhancement needs the whole document, so buffer it in memory
+        buffer = io.StringIO()
+        extractor.extract(buffer)
+        markdown = enhance_with_llm(
+            buffer.getvalue(), str(input_path), args.verbose, use_cache=not args.no_cache
+        )
         # Recalculate with LLM bonus
         extractor.metrics.llm_enhanced = True
         fetch_score = extractor.metrics.calculate_fetch_score()
+    elif args.score_only:
+        with open(os.devnull, 'w', encoding='utf-8') as sink:
+            fetch_score = extractor.extract(sink)
     
     if args.score_only:
-        print(json.dumps(fetch_score, indent=2))
+        print(dump_json(fetch_score))
         return
     
-    # Generate final output with report
-    final_markdown = generate_report(markdown, fetch_score, str(output_path))
-    
-    # Write output
-    output_path.write_text(final_markdown, encoding='utf-8')
+    # Stream extracted pages to a temp file beside the output, then append the
+    # report and rename, so a failed run never clobbers an existing output
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE,
+                                     dir=output_path.parent, suffix='.tmp',
+                                     delete=False) as out:
+        try:
+            if args.llm_enhance:
+                out.write(markdown)
+            else:
+                fetch_score = extractor.extract(out)
+            out.write(format_report(fetch_score))
+        except BaseException:
+            out.close()
+            os.unlink(out.name)
+            raise
+    # NamedTemporaryFile is created 0600; give the output the usual umask-based mode
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(out.name, 0o666 & ~umask)
+    os.replace(out.name, output_path)
     
     if args.verbose:
         print(f"\n[SUCCESS] Output written to: {output_path}", file=sys.stderr)